@@ -59,6 +59,45 @@ type TorchPackageVersions = Record<TorchPackageName, string | undefined>;
 
 const TORCH_PACKAGE_NAMES: TorchPackageName[] = ['torch', 'torchaudio', 'torchvision'];
 
+/** Matches the trailer of `uv pip install --dry-run` when no packages need to change. */
+const UV_NO_CHANGES_REGEX = /\bWould make no changes\s+$/;
+
+/**
+ * Matches the dry-run output of a known ComfyUI-Manager requirements upgrade.
+ * - Match the original case: 2 packages (uv + toml) | Added in https://github.com/ltdrdata/ComfyUI-Manager/commit/816a53a7b1a057af373c458ebf80aaae565b996b
+ * - Match the new case: 1 package (chardet) | Added in https://github.com/ltdrdata/ComfyUI-Manager/commit/60a5e4f2614c688b41a1ebaf0694953eb26db38a
+ */
+const UV_MANAGER_UPGRADE_REGEX = /\bWould install [1-3] packages?(\s+\+ (toml|uv|chardet)==[\d.]+){1,3}\s*$/;
+
+/** Packages that may be added or removed by a known core requirements upgrade. */
+const CORE_UPGRADE_PACKAGES = [
+  'aiohttp',
+  'av',
+  'yarl',
+  'comfyui-workflow-templates',
+  'comfyui-embedded-docs',
+  'pydantic',
+  'pydantic-core',
+  'pydantic-settings',
+  'annotated-types',
+  'typing-inspection',
+  'alembic',
+  'sqlalchemy',
+  'greenlet',
+  'mako',
+  'python-dotenv',
+];
+const CORE_UPGRADE_PACKAGES_PATTERN = CORE_UPGRADE_PACKAGES.join('|');
+
+/** Matches a dry-run removal of any package not known to be part of a core upgrade. */
+const UV_UNKNOWN_REMOVAL_REGEX = new RegExp(String.raw`^\s*- (?!${CORE_UPGRADE_PACKAGES_PATTERN}).*==`);
+
+/**
+ * Matches any dry-run package addition.
+ * The first capture group is only set if the package is known to be part of a core upgrade.
+ */
+const UV_ADDITION_REGEX = new RegExp(String.raw`^\s*\+ (?:(${CORE_UPGRADE_PACKAGES_PATTERN})==)?`);
+
 type AmdInstallComponent = 'ROCm SDK' | 'PyTorch';
 
 export function getPipInstallArgs(config: PipInstallConfig): string[] {
@@ -928,38 +967,27 @@ export class VirtualEnvironment implements HasTelemetry, PythonExecutor {
     };
 
     const hasAllPackages = (output: string) => {
-      const venvOk = output.search(/\bWould make no changes\s+$/) !== -1;
+      const venvOk = UV_NO_CHANGES_REGEX.test(output);
       if (!venvOk) log.warn(output);
       return venvOk;
     };
 
     // Manager upgrade in 0.4.18 - uv, toml (exactly)
-    const isManagerUpgrade = (output: string) => {
-      // Match the original case: 2 packages (uv + toml) | Added in https://github.com/ltdrdata/ComfyUI-Manager/commit/816a53a7b1a057af373c458ebf80aaae565b996b
-      // Match the new case: 1 package (chardet) | Added in https://github.com/ltdrdata/ComfyUI-Manager/commit/60a5e4f2614c688b41a1ebaf0694953eb26db38a
-      const anyCombination = /\bWould install [1-3] packages?(\s+\+ (toml|uv|chardet)==[\d.]+){1,3}\s*$/;
-      return anyCombination.test(output);
-    };
+    const isManagerUpgrade = (output: string) => UV_MANAGER_UPGRADE_REGEX.test(output);
 
     // Package upgrade in 0.4.21 - aiohttp, av, yarl
     const isCoreUpgrade = (output: string) => {
       const lines = output.split('\n');
       let adds = 0;
       for (const line of lines) {
+        // Summary lines (Resolved, Would install, etc) cannot match any pattern below
+        if (!line.includes('+ ') && !line.includes('- ')) continue;
+
         // Reject upgrade if removing an unrecognised package
-        if (
-          line.search(
-            /^\s*- (?!aiohttp|av|yarl|comfyui-workflow-templates|comfyui-embedded-docs|pydantic|pydantic-core|pydantic-settings|annotated-types|typing-inspection|alembic|sqlalchemy|greenlet|mako|python-dotenv).*==/
-          ) !== -1
-        )
-          return false;
-        if (line.search(/^\s*\+ /) !== -1) {
-          if (
-            line.search(
-              /^\s*\+ (aiohttp|av|yarl|comfyui-workflow-templates|comfyui-embedded-docs|pydantic|pydantic-core|pydantic-settings|annotated-types|typing-inspection|alembic|sqlalchemy|greenlet|mako|python-dotenv)==/
-            ) === -1
-          )
-            return false;
+        if (UV_UNKNOWN_REMOVAL_REGEX.test(line)) return false;
+        const addition = UV_ADDITION_REGEX.exec(line);
+        if (addition) {
+          if (!addition[1]) return false;
           adds++;
         }
         // An unexpected package means this is not a package upgrade